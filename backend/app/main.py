@@ -5,6 +5,7 @@ from elasticsearch import Elasticsearch
 import hazelcast
 
 from app.routers import user_router, post_router, search_router
+from app.services.mongo_service import ensure_indexes
 
 app = FastAPI(
     title="Микроблог API",
@@ -48,6 +49,14 @@ try:
 except Exception as e:
     HZ_STATUS = f"❌ {str(e)[:50]}"
 
+@app.on_event("startup")
+def create_indexes():
+    """Создание индексов MongoDB"""
+    try:
+        ensure_indexes()
+    except Exception as e:
+        print(f"❌ Уникальный индекс users.username не создан, уникальность имен НЕ гарантируется: {str(e)[:200]}")
+
 # Подключение роутеров
 app.include_router(user_router.router, prefix="/api/v1")
 app.include_router(post_router.router, prefix="/api/v1")
@@ -1 +1 @@
-from pydantic import BaseModel, Field, EmailStrfrom typing import List, Optionalfrom datetime import datetimeclass UserBase(BaseModel):    username: str = Field(..., min_length=3, max_length=50)    email: EmailStr    bio: Optional[str] = Field("", max_length=500)class UserCreate(UserBase):    passclass UserResponse(UserBase):    id: str = Field(..., alias="_id")    followers: List[str] = []    following: List[str] = []    followers_count: int = 0    following_count: int = 0    created_at: datetime        class Config:        allow_population_by_field_name = True
\ No newline at end of file
+from pydantic import BaseModel, ConfigDict, Field, EmailStrfrom typing import Optionalfrom datetime import datetimeclass UserBase(BaseModel):    username: str = Field(..., min_length=3, max_length=50)    email: EmailStr    bio: Optional[str] = Field("", max_length=500)class UserCreate(UserBase):    passclass UserProfile(UserBase):    id: str = Field(..., alias="_id")    followers_count: int = 0    following_count: int = 0    created_at: datetime        model_config = ConfigDict(populate_by_name=True)
\ No newline at end of file
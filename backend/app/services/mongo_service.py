@@ -1 +1 @@
-from pymongo import MongoClientfrom bson import ObjectIdfrom datetime import datetimefrom typing import List, Dict, Anyclient = MongoClient("mongodb://localhost:27017")db = client["microblog"]users_collection = db["users"]posts_collection = db["posts"]# ========== ПОЛЬЗОВАТЕЛИ ==========def create_user(user_data: dict) -> str:    """Создает нового пользователя"""    user_data["created_at"] = datetime.utcnow()    user_data["followers"] = []    user_data["following"] = []        result = users_collection.insert_one(user_data)    return str(result.inserted_id)def get_user_by_username(username: str) -> Dict[str, Any]:    """Находит пользователя по имени"""    return users_collection.find_one({"username": username})def get_user_by_id(user_id: str) -> Dict[str, Any]:    """Находит пользователя по ID"""    try:        return users_collection.find_one({"_id": ObjectId(user_id)})    except:        return Nonedef follow_user(user_id: str, target_user_id: str) -> bool:    """Подписаться на пользователя"""    # Добавляем в following    users_collection.update_one(        {"_id": ObjectId(user_id)},        {"$addToSet": {"following": target_user_id}}    )    # Добавляем в followers    users_collection.update_one(        {"_id": ObjectId(target_user_id)},        {"$addToSet": {"followers": user_id}}    )    return Truedef unfollow_user(user_id: str, target_user_id: str) -> bool:    """Отписаться от пользователя"""    # Удаляем из following    users_collection.update_one(        {"_id": ObjectId(user_id)},        {"$pull": {"following": target_user_id}}    )    # Удаляем из followers    users_collection.update_one(        {"_id": ObjectId(target_user_id)},        {"$pull": {"followers": user_id}}    )    return True# ========== ПОСТЫ ==========def create_post(post_data: dict) -> str:    """Создает новый пост"""    post_data["created_at"] = datetime.utcnow()    post_data["likes"] = []        result = posts_collection.insert_one(post_data)    return str(result.inserted_id)def get_post_by_id(post_id: str) -> Dict[str, Any]:    """Находит пост по ID"""    try:        return posts_collection.find_one({"_id": ObjectId(post_id)})    except:        return Nonedef like_post(post_id: str, user_id: str) -> bool:    """Добавляет лайк к посту"""    posts_collection.update_one(        {"_id": ObjectId(post_id)},        {"$addToSet": {"likes": user_id}}    )    return Truedef get_posts_by_user(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:    """Получает посты пользователя"""    posts = posts_collection.find(        {"user_id": user_id}    ).sort("created_at", -1).limit(limit)    return list(posts)def get_feed_from_db(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:    """Получает ленту из БД (посты от пользователей, на которых подписан)"""    user = get_user_by_id(user_id)    if not user or not user.get("following"):        return []        following = user["following"]    posts = posts_collection.find(        {"user_id": {"$in": following}}    ).sort("created_at", -1).limit(limit)    return list(posts)
\ No newline at end of file
+from pymongo import MongoClient, timeoutfrom bson import ObjectIdfrom datetime import datetimefrom typing import List, Dict, Any, Optionalclient = MongoClient("mongodb://localhost:27017")db = client["microblog"]users_collection = db["users"]posts_collection = db["posts"]# Выставляется при старте, если уникальный индекс по username создан_username_index_ready = Falsedef ensure_indexes(timeout_seconds: float = 5.0) -> None:    """Создает уникальный индекс по username (вызывается при старте приложения)"""    global _username_index_ready    with timeout(timeout_seconds):        users_collection.create_index("username", unique=True)    _username_index_ready = Truedef has_username_index() -> bool:    """Гарантирует ли MongoDB уникальность имен"""    return _username_index_ready# ========== ПОЛЬЗОВАТЕЛИ ==========def create_user(user_data: dict) -> str:    """Создает нового пользователя"""    user_data["created_at"] = datetime.utcnow()    user_data["followers"] = []    user_data["following"] = []        result = users_collection.insert_one(user_data)    return str(result.inserted_id)def get_user_by_username(username: str) -> Dict[str, Any]:    """Находит пользователя по имени"""    return users_collection.find_one({"username": username})def username_exists(username: str) -> bool:    """Проверяет, занято ли имя (читает только _id)"""    return users_collection.find_one({"username": username}, {"_id": 1}) is not Nonedef get_user_by_id(user_id: str) -> Dict[str, Any]:    """Находит пользователя по ID"""    try:        return users_collection.find_one({"_id": ObjectId(user_id)})    except:        return Nonedef get_user_summaries(usernames: List[str]) -> List[Dict[str, Any]]:    """Находит пользователей по именам без массивов подписок, только счетчики"""    return list(users_collection.aggregate([        {"$match": {"username": {"$in": usernames}}},        {"$project": {            "username": 1,            "email": 1,            "bio": 1,            "created_at": 1,            "followers_count": {"$size": {"$ifNull": ["$followers", []]}},            "following_count": {"$size": {"$ifNull": ["$following", []]}}        }}    ]))def follow_user(user_id: str, target_user_id: str) -> Optional[bool]:    """Подписаться на пользователя (False, если уже подписан; None, если пользователя нет)"""    # Добавляем в following    result = users_collection.update_one(        {"_id": ObjectId(user_id)},        {"$addToSet": {"following": target_user_id}}    )    if not result.matched_count:        return None    if not result.modified_count:        return False    # Добавляем в followers    result = users_collection.update_one(        {"_id": ObjectId(target_user_id)},        {"$addToSet": {"followers": user_id}}    )    if not result.matched_count:        # Цель удалена - откатываем подписку        users_collection.update_one(            {"_id": ObjectId(user_id)},            {"$pull": {"following": target_user_id}}        )        return None    return Truedef unfollow_user(user_id: str, target_user_id: str) -> Optional[bool]:    """Отписаться от пользователя (False, если не был подписан; None, если пользователя нет)"""    # Удаляем из following    result = users_collection.update_one(        {"_id": ObjectId(user_id)},        {"$pull": {"following": target_user_id}}    )    if not result.matched_count:        return None    if not result.modified_count:        return False    # Удаляем из followers    users_collection.update_one(        {"_id": ObjectId(target_user_id)},        {"$pull": {"followers": user_id}}    )    return True# ========== ПОСТЫ ==========def create_post(post_data: dict) -> str:    """Создает новый пост"""    post_data["created_at"] = datetime.utcnow()    post_data["likes"] = []        result = posts_collection.insert_one(post_data)    return str(result.inserted_id)def get_post_by_id(post_id: str) -> Dict[str, Any]:    """Находит пост по ID"""    try:        return posts_collection.find_one({"_id": ObjectId(post_id)})    except:        return Nonedef like_post(post_id: str, user_id: str) -> bool:    """Добавляет лайк к посту"""    posts_collection.update_one(        {"_id": ObjectId(post_id)},        {"$addToSet": {"likes": user_id}}    )    return Truedef get_posts_by_user(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:    """Получает посты пользователя"""    posts = posts_collection.find(        {"user_id": user_id}    ).sort("created_at", -1).limit(limit)    return list(posts)def get_feed_from_db(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:    """Получает ленту из БД (посты от пользователей, на которых подписан)"""    user = get_user_by_id(user_id)    if not user or not user.get("following"):        return []        following = user["following"]    posts = posts_collection.find(        {"user_id": {"$in": following}}    ).sort("created_at", -1).limit(limit)    return list(posts)
\ No newline at end of file
@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from app.services.cache_service import client
+from app.services.mongo_service import get_user_summaries
+
+# Локальный LRU перед Hazelcast хранит только найденных пользователей:
+# имя -> id и поля профиля не меняются, поэтому запись не устаревает
+LOCAL_MAX_SIZE = 1000
+LOCAL_TTL = 30
+USER_TTL = 3600
+MISSING_TTL = 10
+
+# Счетчики подписок живут отдельно и недолго, между чтениями
+# их поправляют на месте при подписке и отписке
+COUNTERS_TTL = 60
+COUNTERS_RETRIES = 5
+
+# Маркер отрицательного кэша (имя не найдено в MongoDB)
+MISSING = {"missing": True}
+
+user_lookup_map = client.get_map("user_lookup").blocking()
+user_counters_map = client.get_map("user_counters").blocking()
+
+_local_cache = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _local_get(username: str):
+    """Возвращает запись из локального LRU или None, если ее нет"""
+    with _local_lock:
+        entry = _local_cache.get(username)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at < time.monotonic():
+            del _local_cache[username]
+            return None
+        _local_cache.move_to_end(username)
+        return record
+
+
+def _local_put(username: str, record: Dict[str, Any]) -> None:
+    """Кладет запись в локальный LRU, вытесняя самые старые"""
+    with _local_lock:
+        _local_cache[username] = (time.monotonic() + LOCAL_TTL, record)
+        _local_cache.move_to_end(username)
+        while len(_local_cache) > LOCAL_MAX_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def _to_record(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Компактная запись пользователя для кэша (без счетчиков)"""
+    created_at = user.get("created_at")
+    return {
+        "id": str(user["_id"]),
+        "username": user["username"],
+        "email": user.get("email", ""),
+        "bio": user.get("bio", ""),
+        "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else created_at
+    }
+
+
+def _to_counters(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Счетчики подписок; срок жизни хранится в самой записи,
+    чтобы replace не продлевал его"""
+    return {
+        "followers_count": user.get("followers_count", 0),
+        "following_count": user.get("following_count", 0),
+        "expires_at": time.time() + COUNTERS_TTL
+    }
+
+
+def _cache_put(username: str, record: Dict[str, Any]) -> None:
+    """Кладет положительную запись в Hazelcast и локальный LRU"""
+    try:
+        user_lookup_map.put(username, record, ttl=USER_TTL)
+    except Exception as e:
+        print(f"Warning: user lookup cache write failed: {e}")
+    _local_put(username, record)
+
+
+def _counters_put(user_id: str, counters: Dict[str, Any], overwrite: bool = False) -> None:
+    """Кладет счетчики в Hazelcast; без overwrite не затирает поправленные на месте"""
+    try:
+        if overwrite:
+            user_counters_map.put(user_id, counters, ttl=COUNTERS_TTL)
+        else:
+            user_counters_map.put_if_absent(user_id, counters, ttl=COUNTERS_TTL)
+    except Exception as e:
+        print(f"Warning: user counters cache write failed: {e}")
+
+
+def _counters_get(user_id: str) -> Optional[Dict[str, Any]]:
+    """Читает счетчики из Hazelcast, просроченные считает промахом"""
+    try:
+        counters = user_counters_map.get(user_id)
+    except Exception as e:
+        print(f"Warning: user counters cache read failed: {e}")
+        return None
+    if not counters or counters["expires_at"] < time.time():
+        return None
+    return counters
+
+
+def resolve_usernames(usernames: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Разрешает имена в компактные записи: локальный LRU -> Hazelcast -> MongoDB"""
+    found = {}
+    pending = []
+    for username in dict.fromkeys(usernames):
+        record = _local_get(username)
+        if record is None:
+            pending.append(username)
+        else:
+            found[username] = record
+
+    if pending:
+        try:
+            cached = user_lookup_map.get_all(pending)
+        except Exception as e:
+            # Недоступность Hazelcast считаем промахом
+            print(f"Warning: user lookup cache read failed: {e}")
+            cached = {}
+        for username, record in cached.items():
+            # Отрицательные записи локально не храним: иначе другие процессы
+            # не увидят только что созданного пользователя
+            if record != MISSING:
+                _local_put(username, record)
+            found[username] = record
+        pending = [username for username in pending if username not in cached]
+
+    if pending:
+        # Один запрос в MongoDB на все промахи
+        for user in get_user_summaries(pending):
+            record = _to_record(user)
+            _cache_put(record["username"], record)
+            _counters_put(record["id"], _to_counters(user))
+            found[record["username"]] = record
+
+        # Отсутствующие имена кэшируем ненадолго; put_if_absent не дает
+        # опоздавшему промаху затереть запись только что созданного пользователя
+        for username in pending:
+            if username not in found:
+                try:
+                    user_lookup_map.put_if_absent(username, MISSING, ttl=MISSING_TTL)
+                except Exception as e:
+                    print(f"Warning: user lookup cache write failed: {e}")
+                found[username] = MISSING
+
+    return {
+        username: None if found[username] == MISSING else found[username]
+        for username in usernames
+    }
+
+
+def resolve_username(username: str) -> Optional[Dict[str, Any]]:
+    """Разрешает одно имя пользователя"""
+    return resolve_usernames([username])[username]
+
+
+def get_user_profile(username: str) -> Optional[Dict[str, Any]]:
+    """Компактная запись вместе со счетчиками подписок"""
+    user = resolve_username(username)
+    if not user:
+        return None
+
+    counters = _counters_get(user["id"])
+    if counters is None:
+        summaries = get_user_summaries([username])
+        if not summaries:
+            invalidate_usernames(username)
+            return None
+        counters = _to_counters(summaries[0])
+        _counters_put(user["id"], counters)
+
+    return {
+        **user,
+        "followers_count": counters["followers_count"],
+        "following_count": counters["following_count"]
+    }
+
+
+def adjust_counter(user_id: str, field: str, delta: int) -> None:
+    """Меняет счетчик на месте; если записи нет, ее заполнит следующее чтение"""
+    try:
+        for _ in range(COUNTERS_RETRIES):
+            current = user_counters_map.get(user_id)
+            if current is None:
+                return
+            updated = {**current, field: max(current[field] + delta, 0)}
+            if user_counters_map.replace_if_same(user_id, current, updated):
+                return
+        # Не удалось из-за конкурентных изменений: пусть перечитается из MongoDB
+        user_counters_map.delete(user_id)
+    except Exception as e:
+        print(f"Warning: user counters cache update failed: {e}")
+
+
+def store_user(user: Dict[str, Any]) -> None:
+    """Кэширует только что созданного пользователя, вытесняя отрицательную запись"""
+    record = _to_record(user)
+    _cache_put(record["username"], record)
+    _counters_put(record["id"], _to_counters(user), overwrite=True)
+
+
+def invalidate_usernames(*usernames: str) -> None:
+    """Сбрасывает записи после переименования или удаления пользователя"""
+    with _local_lock:
+        for username in usernames:
+            _local_cache.pop(username, None)
+    for username in usernames:
+        try:
+            user_lookup_map.delete(username)
+        except Exception as e:
+            print(f"Warning: user lookup cache invalidation failed: {e}")